@@ -1,11 +1,14 @@
 import os
 import argparse
-import tempfile
-import subprocess
-import sys
+import csv
+import multiprocessing
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from tqdm import tqdm
+from exiftool_daemon import (
+    ExifToolDaemon, exiftool_available, find_exiftool, init_worker_daemon, map_folders,
+    worker_daemon
+)
 
 """
 DJI Image Metadata Copy Tool
@@ -16,62 +19,125 @@ Reads all metadata from metadata file (metadata.txt) and copies it to correspond
 Ensures all geotags and camera information are correctly copied.
 """
 
+# Options shared by every copy command, passed once as ExifTool -common_args
+EXIFTOOL_COPY_COMMON_ARGS = ["-overwrite_original"]
+
+def _scan_files_by_stem(directory: Path, extensions: Tuple[str, ...]) -> Dict[str, Path]:
+    """
+    List the files of a directory by stem in a single scandir pass
+
+    Args:
+        directory: Directory to scan
+        extensions: Lower-case file extensions to accept
+
+    Returns:
+        Dict[str, Path]: File paths keyed by file stem (extension matched case insensitively)
+    """
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(extensions) and entry.is_file():
+                path = Path(entry.path)
+                files[path.stem] = path
+    return files
+
+def _build_copy_args(
+    jpg_path: Path, tiff_path: Path, metadata: Dict[str, str]
+) -> List[str]:
+    """
+    Build the ExifTool arguments that copy metadata from JPG to TIFF file
+
+    Args:
+        jpg_path: JPG file path
+        tiff_path: TIFF file path
+        metadata: Metadata dictionary
+
+    Returns:
+        List[str]: ExifTool arguments of a single command
+    """
+    args = [
+        "-TagsFromFile", str(jpg_path),
+        "-all:all",
+        "-unsafe"
+    ]
+
+    for tag, value in metadata.items():
+        if tag.startswith('Xmp.'):
+            clean_tag = tag.replace('Xmp.', '')
+            args.append(f"-XMP:{clean_tag}={value}")
+
+    args.append(str(tiff_path))
+    return args
+
+def _copy_batch(
+    daemon: ExifToolDaemon, tasks: List[Tuple[Path, Path, Dict[str, str]]]
+) -> Iterator[bool]:
+    """
+    Copy metadata for many image pairs through one ExifTool daemon
+
+    All commands are streamed to the daemon and one result is read per
+    {ready} marker, so ExifTool never idles between image pairs.
+
+    Args:
+        daemon: ExifTool daemon used to run the commands
+        tasks: (jpg_path, tiff_path, metadata) tuples
+
+    Yields:
+        bool: True for each successfully copied pair, False otherwise
+    """
+    pending = []
+    for jpg_path, tiff_path, metadata in tasks:
+        if tiff_path.exists():
+            pending.append((tiff_path, _build_copy_args(jpg_path, tiff_path, metadata)))
+        else:
+            print(f"Error: TIFF file not found: {tiff_path.absolute()}")
+            yield False
+
+    try:
+        results = daemon.execute_many(args for _, args in pending)
+        for (tiff_path, _), _ in zip(pending, results):
+            if daemon.last_status != 0:
+                print(f"Warning: exiftool failed to copy metadata to {tiff_path.name}: {daemon.last_stderr}")
+                yield False
+            else:
+                yield True
+    except Exception as e:
+        print(f"Error: Unable to copy metadata: {str(e)}")
+
+def _worker_copy(tasks: List[Tuple[Path, Path, Dict[str, str]]]) -> List[bool]:
+    """
+    Copy metadata of a chunk of image pairs inside a pool worker
+
+    Args:
+        tasks: (jpg_path, tiff_path, metadata) tuples
+
+    Returns:
+        List[bool]: Success flag of each pair
+    """
+    return list(_copy_batch(worker_daemon(), tasks))
+
 class MetadataCopier:
     """Metadata copier"""
-    def __init__(self):
-        """Initialize copier"""
-        self.exiftool_path = self._find_exiftool()
-
-        try:
-            subprocess.run(
-                [self.exiftool_path, "-ver"],
-                capture_output=True,
-                check=True
-            )
-            self.exiftool_available = True
-            print(f"ExifTool successfully detected: {self.exiftool_path}")
-        except (subprocess.SubprocessError, FileNotFoundError):
-            print("Warning: ExifTool not found. Will use limited metadata copying method.")
-            self.exiftool_available = False
-    def _find_exiftool(self) -> str:
+    def __init__(self, workers: Optional[int] = None, direct: bool = False):
         """
-        Locate ExifTool executable path
+        Initialize copier
 
-        Returns:
-            str: Path to ExifTool executable
+        Args:
+            workers: Number of parallel ExifTool workers, default is CPU count
+            direct: Copy tags straight from the JPG files without reading metadata.txt
         """
-        root_dir = Path(__file__).resolve().parent
-
-        exiftool_dir = root_dir / "exiftool-13.29_64"
-        exiftool_windows = exiftool_dir / "exiftool.exe"
-        exiftool_unix = exiftool_dir / "exiftool"
-        exiftool_asset = (
-            root_dir / "Thermal-Tools-main" / "assets" /
-            "linux" / "exiftool" / "exiftool"
-        )
-        exiftool_packages = sorted(
-            exiftool_dir.glob("Image-ExifTool-*/exiftool"),
-            reverse=True
-        )
+        self.workers = workers or os.cpu_count() or 1
+        self.direct = direct
+        self.exiftool_path = find_exiftool()
+        self.exiftool_available = exiftool_available(self.exiftool_path)
 
-        if sys.platform.startswith("win"):
-            if exiftool_windows.exists():
-                return str(exiftool_windows)
+        if self.exiftool_available:
+            print(f"ExifTool successfully detected: {self.exiftool_path}")
         else:
-            if exiftool_unix.exists():
-                exiftool_unix.chmod(0o755)
-                return str(exiftool_unix)
-            for pkg_exe in exiftool_packages:
-                pkg_exe.chmod(0o755)
-                return str(pkg_exe)
-            if exiftool_asset.exists():
-                exiftool_asset.chmod(0o755)
-                return str(exiftool_asset)
-            if exiftool_windows.exists():
-                exiftool_windows.chmod(0o755)
-                return str(exiftool_windows)
-
-        return "exiftool.exe" if sys.platform.startswith("win") else "exiftool"
+            print("Warning: ExifTool not found. Will use limited metadata copying method.")
+
+        self.daemon = ExifToolDaemon(self.exiftool_path, EXIFTOOL_COPY_COMMON_ARGS)
+
     def _load_metadata(self, metadata_file: Path) -> Dict[str, Dict[str, str]]:
         """
         Load metadata from metadata.txt
@@ -87,17 +153,26 @@ class MetadataCopier:
 
         metadata_dict = {}
         
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            header = f.readline().strip().split(',')
-            if not header or header[0] != 'ImageName':
+        with open(metadata_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or reader.fieldnames[0] != 'ImageName':
                 raise ValueError(f"Invalid metadata file format: {metadata_file}")
 
-            for line in f:
-                values = line.strip().split(',')
-                if len(values) >= len(header):
-                    image_name = values[0]
-                    metadata = {header[i]: values[i] for i in range(1, len(header))}
-                    metadata_dict[image_name] = metadata
+            extra_cell_rows = 0
+            for row in reader:
+                if None in row.values():
+                    continue
+                # Rows with more cells than columns (e.g. unquoted values
+                # containing commas in older metadata.txt files) keep the
+                # extra cells under the None key: ignore them
+                if row.pop(None, None) is not None:
+                    extra_cell_rows += 1
+                metadata_dict[row.pop('ImageName')] = row
+
+        if extra_cell_rows:
+            print(
+                f"Warning: Ignored extra cells in {extra_cell_rows} rows of {metadata_file}"
+            )
 
         return metadata_dict
 
@@ -121,18 +196,14 @@ class MetadataCopier:
             print(f"Warning: Output directory not found {output_dir}")
             return []
 
-        jpg_files = {f.stem: f for f in input_dir.glob('*.jpg')}
-        jpg_files.update({f.stem: f for f in input_dir.glob('*.JPG')})
-        
-        tiff_files = {f.stem: f for f in output_dir.glob('*.tiff')}
-        tiff_files.update({f.stem: f for f in output_dir.glob('*.TIFF')})
-
-        matches = []
-        for stem, jpg_path in jpg_files.items():
-            if stem in tiff_files:
-                matches.append((jpg_path, tiff_files[stem]))
+        jpg_files = _scan_files_by_stem(input_dir, ('.jpg', '.jpeg'))
+        tiff_files = _scan_files_by_stem(output_dir, ('.tif', '.tiff'))
 
-        return matches
+        return [
+            (jpg_path, tiff_files[stem])
+            for stem, jpg_path in jpg_files.items()
+            if stem in tiff_files
+        ]
 
     def _copy_metadata_to_tiff(
         self, jpg_path: Path, tiff_path: Path, metadata: Dict[str, str]
@@ -148,64 +219,12 @@ class MetadataCopier:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            if not tiff_path.exists():
-                print(f"Error: TIFF file not found: {tiff_path.absolute()}")
-                return False
-
-            if self.exiftool_available:
-                cmd = [
-                    self.exiftool_path,
-                    "-overwrite_original",
-                    "-TagsFromFile", str(jpg_path),
-                    "-all:all",
-                    "-unsafe",
-                    str(tiff_path)
-                ]
-
-                result = subprocess.run(cmd, capture_output=True, text=True)
-
-                if result.returncode != 0:
-                    print(f"Warning: exiftool failed to copy metadata: {result.stderr}")
-                    return False
-
-                xmp_tags = {}
-                for tag, value in metadata.items():
-                    if tag.startswith('Xmp.'):
-                        xmp_tags[tag] = value
-                
-                if xmp_tags:
-                    with tempfile.NamedTemporaryFile(
-                        mode='w', suffix='.txt', delete=False
-                    ) as temp_file:
-                        temp_path = temp_file.name
-                        for tag, value in xmp_tags.items():
-                            clean_tag = tag.replace('Xmp.', '')
-                            temp_file.write(f"-XMP:{clean_tag}={value}\n")
-
-                    xmp_cmd = [
-                        self.exiftool_path,
-                        "-overwrite_original",
-                        "-@ " + temp_path,
-                        str(tiff_path)
-                    ]
-
-                    xmp_result = subprocess.run(xmp_cmd, capture_output=True, text=True)
-
-                    os.remove(temp_path)
-
-                    if xmp_result.returncode != 0:
-                        print(f"Warning: exiftool failed to add XMP tags: {xmp_result.stderr}")
-
-                return True
-            else:
-                print(f"Using fallback method to copy metadata to: {tiff_path.name}")
-                return False
-
-        except Exception as e:
-            print(f"Error: Unable to copy metadata to {tiff_path.name}: {str(e)}")
+        if not self.exiftool_available:
+            print(f"Using fallback method to copy metadata to: {tiff_path.name}")
             return False
 
+        return next(_copy_batch(self.daemon, [(jpg_path, tiff_path, metadata)]), False)
+
     def process_folder(self, folder_path: Union[str, Path]) -> Tuple[int, int]:
         """
         Process images in a single folder
@@ -217,13 +236,15 @@ class MetadataCopier:
             Tuple[int, int]: (success_count, total_count)
         """
         folder_path = Path(folder_path)
-        
-        metadata_file = folder_path / "metadata.txt"
-        try:
-            metadata_dict = self._load_metadata(metadata_file)
-        except Exception as e:
-            print(f"Error: Failed to load metadata - {str(e)}")
-            return (0, 0)
+
+        metadata_dict = {}
+        if not self.direct:
+            metadata_file = folder_path / "metadata.txt"
+            try:
+                metadata_dict = self._load_metadata(metadata_file)
+            except Exception as e:
+                print(f"Error: Failed to load metadata - {str(e)}")
+                return (0, 0)
 
         matches = self._find_matching_pairs(folder_path)
         if not matches:
@@ -231,18 +252,51 @@ class MetadataCopier:
             return (0, 0)
 
         print(f"Found {len(matches)} pairs of matching images")
-        
+
+        if self.direct:
+            # -TagsFromFile already copies every tag of the JPG file
+            tasks = [(jpg_path, tiff_path, {}) for jpg_path, tiff_path in matches]
+        else:
+            tasks = [
+                (jpg_path, tiff_path, metadata_dict[jpg_path.name])
+                for jpg_path, tiff_path in matches
+                if jpg_path.name in metadata_dict
+            ]
+
         success_count = 0
         pbar_desc = f"Copying metadata - {folder_path.name}"
-        with tqdm(matches, desc=pbar_desc, mininterval=1.0) as pbar:
-            for jpg_path, tiff_path in pbar:
-                jpg_name = jpg_path.name
-                
-                if jpg_name in metadata_dict:
-                    if self._copy_metadata_to_tiff(
-                        jpg_path, tiff_path, metadata_dict[jpg_name]
-                    ):
+        workers = min(self.workers, len(tasks))
+
+        if not self.exiftool_available:
+            with tqdm(tasks, desc=pbar_desc, mininterval=1.0) as pbar:
+                for jpg_path, tiff_path, metadata in pbar:
+                    if self._copy_metadata_to_tiff(jpg_path, tiff_path, metadata):
                         success_count += 1
+            return (success_count, len(matches))
+
+        if workers <= 1:
+            results = _copy_batch(self.daemon, tasks)
+            for success in tqdm(results, total=len(tasks), desc=pbar_desc, mininterval=1.0):
+                if success:
+                    success_count += 1
+            return (success_count, len(matches))
+
+        chunk_size = 8
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+        pool = multiprocessing.Pool(
+            workers,
+            initializer=init_worker_daemon,
+            initargs=(self.exiftool_path, EXIFTOOL_COPY_COMMON_ARGS)
+        )
+        try:
+            with tqdm(total=len(tasks), desc=pbar_desc, mininterval=1.0) as pbar:
+                for results in pool.imap_unordered(_worker_copy, chunks):
+                    success_count += sum(results)
+                    pbar.update(len(results))
+        finally:
+            pool.close()
+            pool.join()
 
         return (success_count, len(matches))
 
@@ -258,21 +312,28 @@ class MetadataCopier:
             print(f"Error: Root directory not found - {root_dir}")
             return
 
-        subfolders = [f for f in root_path.iterdir() if f.is_dir()]
-
-        if not subfolders:
-            print("No subfolders found, processing current directory")
-            success, total = self.process_folder(root_path)
-            if total > 0:
-                print(f"Completed {root_path.name}: success {success}/{total}")
-            return
+        with os.scandir(root_path) as entries:
+            subfolders = [
+                Path(entry.path) for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+            ]
 
-        print(f"Found {len(subfolders)} subfolders")
-
-        for folder in subfolders:
-            success, total = self.process_folder(folder)
-            if total > 0:
-                print(f"Completed {folder.name}: success {success}/{total}")
+        try:
+            if not subfolders:
+                print("No subfolders found, processing current directory")
+                success, total = self.process_folder(root_path)
+                if total > 0:
+                    print(f"Completed {root_path.name}: success {success}/{total}")
+                return
+
+            print(f"Found {len(subfolders)} subfolders")
+
+            results = map_folders(self, subfolders)
+            for folder, (success, total) in zip(subfolders, results):
+                if total > 0:
+                    print(f"Completed {folder.name}: success {success}/{total}")
+        finally:
+            self.daemon.close()
 
 def main():
     """Main function"""
@@ -280,10 +341,17 @@ def main():
     parser.add_argument("-d", "--directory",
                       default="main",
                       help="Specify root directory path to process (default is 'main')")
+    parser.add_argument("-j", "--workers",
+                      type=int,
+                      default=None,
+                      help="Number of parallel ExifTool workers (default is CPU count)")
+    parser.add_argument("--direct",
+                      action="store_true",
+                      help="Copy tags directly from the JPG files without reading metadata.txt")
     
     args = parser.parse_args()
     
-    copier = MetadataCopier()
+    copier = MetadataCopier(args.workers, args.direct)
     try:
         print(f"\nProcessing directory: {args.directory}")
         copier.process_all(args.directory)
@@ -0,0 +1,359 @@
+import os
+import functools
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+"""
+ExifTool Daemon
+
+Description:
+---------
+Locates the bundled ExifTool and keeps a single ExifTool process running in
+-stay_open mode so that metadata commands for many images reuse one Perl
+interpreter instead of starting a new exiftool process per image.
+"""
+
+_worker_daemon: Optional["ExifToolDaemon"] = None
+
+@functools.lru_cache(maxsize=1)
+def find_exiftool() -> str:
+    """
+    Locate ExifTool executable path (probed once per process)
+
+    Returns:
+        str: Path to ExifTool executable
+    """
+    root_dir = Path(__file__).resolve().parent
+
+    exiftool_dir = root_dir / "exiftool-13.29_64"
+    exiftool_windows = exiftool_dir / "exiftool.exe"
+    exiftool_unix = exiftool_dir / "exiftool"
+    exiftool_asset = (
+        root_dir / "Thermal-Tools-main" / "assets" /
+        "linux" / "exiftool" / "exiftool"
+    )
+    exiftool_packages = sorted(
+        exiftool_dir.glob("Image-ExifTool-*/exiftool"),
+        reverse=True
+    )
+
+    if sys.platform.startswith("win"):
+        if exiftool_windows.exists():
+            return str(exiftool_windows)
+    else:
+        candidates = [exiftool_unix, *exiftool_packages, exiftool_asset, exiftool_windows]
+        for candidate in candidates:
+            if candidate.exists():
+                # Only touch the permissions of the selected file, and only
+                # if it is not executable yet (e.g. after unzipping)
+                if not os.access(candidate, os.X_OK):
+                    candidate.chmod(0o755)
+                return str(candidate)
+
+    return "exiftool.exe" if sys.platform.startswith("win") else "exiftool"
+
+@functools.lru_cache(maxsize=None)
+def exiftool_available(exiftool_path: str) -> bool:
+    """
+    Check if ExifTool can be run (checked once per process and path)
+
+    Args:
+        exiftool_path: Path to ExifTool executable
+
+    Returns:
+        bool: True if ExifTool reports its version, False otherwise
+    """
+    try:
+        subprocess.run(
+            [exiftool_path, "-ver"],
+            capture_output=True,
+            check=True
+        )
+        return True
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+
+class ExifToolDaemon:
+    """Persistent ExifTool process driven through its -stay_open argfile interface"""
+
+    READY_MARKER = "{ready}"
+    STATUS_PREFIX = "{status="
+
+    def __init__(self, exiftool_path: str, common_args: Optional[List[str]] = None):
+        """
+        Initialize daemon (the ExifTool process is started on first use)
+
+        Args:
+            exiftool_path: Path to ExifTool executable
+            common_args: Arguments appended by ExifTool to every command, so
+                         options shared by all commands are sent only once
+        """
+        self.exiftool_path = exiftool_path
+        self.common_args = list(common_args or [])
+        self.process: Optional[subprocess.Popen] = None
+        self.last_status = 0
+        self.last_stderr = ""
+        self._stderr_path: Optional[Path] = None
+        self._stderr_writer = None
+        self._stderr_reader = None
+
+    def __getstate__(self) -> dict:
+        # A running ExifTool cannot be shared with another process; copies
+        # sent to worker processes start their own on first use
+        state = self.__dict__.copy()
+        state.update(
+            process=None, _stderr_path=None, _stderr_writer=None, _stderr_reader=None
+        )
+        return state
+
+    def __enter__(self) -> "ExifToolDaemon":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start the ExifTool process if it is not running yet"""
+        if self.process is not None:
+            return
+
+        # stderr goes to a log file instead of a pipe so that warnings can
+        # never fill a pipe buffer and block ExifTool while we wait on stdout
+        fd, stderr_path = tempfile.mkstemp(prefix="exiftool_", suffix=".log")
+        os.close(fd)
+        self._stderr_path = Path(stderr_path)
+        self._stderr_writer = self._stderr_path.open('ab')
+        self._stderr_reader = self._stderr_path.open('rb')
+
+        self.process = subprocess.Popen(
+            [
+                self.exiftool_path, "-stay_open", "True", "-@", "-",
+                "-common_args", "-charset", "filename=utf8", *self.common_args
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr_writer
+        )
+
+    def execute_raw(self, args: List[str]) -> bytes:
+        """
+        Execute one ExifTool command
+
+        Args:
+            args: ExifTool arguments, one list item per argument
+
+        Returns:
+            bytes: Raw standard output of the command, e.g. -j output that is
+                   handed to a JSON parser as is (exit status and stderr are
+                   kept in last_status and last_stderr)
+        """
+        self.start()
+        self._send(args)
+        return self._receive_raw()
+
+    def execute_many(
+        self, commands: Iterable[List[str]], window: int = 16, raw: bool = False
+    ) -> Iterator[Union[str, bytes]]:
+        """
+        Execute many ExifTool commands, keeping up to `window` of them queued
+        in ExifTool so that it never waits for the next command
+
+        Args:
+            commands: ExifTool argument lists, one per command
+            window: Maximum number of commands sent ahead of their results.
+                    Kept small so the queued commands always fit in the pipe.
+            raw: Yield undecoded bytes instead of str
+
+        Yields:
+            Union[str, bytes]: Standard output of each command in submission order
+                 (last_status is updated before each result is yielded;
+                 last_stderr may also contain messages of queued commands)
+        """
+        self.start()
+        receive = self._receive_raw if raw else self._receive
+        pending = 0
+        try:
+            for args in commands:
+                self._send(args)
+                pending += 1
+                if pending >= window:
+                    pending -= 1
+                    yield receive()
+            while pending:
+                pending -= 1
+                yield receive()
+        finally:
+            # Keep the protocol in sync if the caller stops iterating early
+            while pending:
+                pending -= 1
+                self._receive()
+
+    def _send(self, args: List[str]) -> None:
+        """
+        Write one command to the ExifTool argfile stream
+
+        Args:
+            args: ExifTool arguments, one list item per argument
+        """
+        # -echo3 prints the exit status of this command right before {ready}
+        status_echo = ["-echo3", self.STATUS_PREFIX + "${status}}"]
+        lines = [self._encode_arg(arg) for arg in args] + status_echo
+        command = "\n".join(lines) + "\n-execute\n"
+        self.process.stdin.write(command.encode('utf-8'))
+        self.process.stdin.flush()
+
+    def _receive(self) -> str:
+        """
+        Read the result of the oldest command sent to ExifTool
+
+        Returns:
+            str: Standard output of the command
+        """
+        return self._receive_raw().decode('utf-8', errors='replace')
+
+    def _receive_raw(self) -> bytes:
+        """
+        Read the undecoded result of the oldest command sent to ExifTool
+
+        Returns:
+            bytes: Standard output of the command
+        """
+        ready = self.READY_MARKER.encode()
+        status_prefix = self.STATUS_PREFIX.encode()
+        output = []
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError("ExifTool process terminated unexpectedly")
+            stripped = line.rstrip()
+            if stripped == ready:
+                break
+            if stripped.startswith(status_prefix):
+                self.last_status = int(stripped[len(status_prefix):-1])
+                continue
+            output.append(line)
+
+        self.last_stderr = self._stderr_reader.read().decode('utf-8', errors='replace')
+        return b"".join(output)
+
+    @staticmethod
+    def _encode_arg(arg: str) -> str:
+        """
+        Encode one argument as a single argfile line
+
+        Args:
+            arg: ExifTool argument
+
+        Returns:
+            str: Argument line, escaped as a #[CSTR] line if it contains line
+                 breaks or would otherwise be read as an argfile comment
+        """
+        if "\n" not in arg and "\r" not in arg and not arg.startswith("#"):
+            return arg
+        escaped = arg.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+        return "#[CSTR]" + escaped
+
+    def close(self) -> None:
+        """Stop the ExifTool process and remove its log file"""
+        if self.process is not None:
+            try:
+                self.process.stdin.write(b"-stay_open\nFalse\n")
+                self.process.stdin.flush()
+                self.process.stdin.close()
+                self.process.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+            finally:
+                self.process.stdout.close()
+                self.process = None
+
+        for handle in (self._stderr_writer, self._stderr_reader):
+            if handle is not None:
+                handle.close()
+        self._stderr_writer = None
+        self._stderr_reader = None
+
+        if self._stderr_path is not None:
+            try:
+                self._stderr_path.unlink()
+            except Exception as e:
+                print(f"Warning: Failed to remove ExifTool log file ({str(e)})")
+            self._stderr_path = None
+
+def init_worker_daemon(exiftool_path: str, common_args: Optional[List[str]] = None) -> None:
+    """
+    Pool initializer that starts a process-local ExifTool daemon
+
+    Args:
+        exiftool_path: Path to ExifTool executable
+        common_args: Arguments appended by ExifTool to every command
+    """
+    global _worker_daemon
+    _worker_daemon = ExifToolDaemon(exiftool_path, common_args)
+    _worker_daemon.start()
+    # ExifTool keeps polling a closed stdin, so stop it explicitly when the
+    # worker exits (requires the pool to be shut down with close() + join())
+    Finalize(_worker_daemon, _worker_daemon.close, exitpriority=10)
+
+def _process_folder_job(processor: Any, folder_path: Path, workers: int) -> Any:
+    """
+    Process one folder inside a folder-level worker process
+
+    Args:
+        processor: Copy of the folder processor made for this worker process
+        folder_path: Folder path
+        workers: Number of ExifTool workers available to this folder
+
+    Returns:
+        Any: Result of processor.process_folder
+    """
+    processor.workers = workers
+    try:
+        return processor.process_folder(folder_path)
+    finally:
+        processor.daemon.close()
+
+def map_folders(processor: Any, folders: List[Path]) -> Iterator[Any]:
+    """
+    Run processor.process_folder for every folder, several folders at once
+    when the processor has more workers than one folder needs
+
+    Args:
+        processor: Folder processor with `workers`, `daemon` (ExifToolDaemon)
+                   and `process_folder(folder_path)`
+        folders: Folder paths
+
+    Yields:
+        Any: Result of processor.process_folder for each folder, in folder order
+    """
+    folder_workers = min(processor.workers, len(folders))
+    if folder_workers <= 1:
+        yield from map(processor.process_folder, folders)
+        return
+
+    # Folders are independent, so process several of them at once and
+    # split the ExifTool workers between them
+    inner_workers = max(1, processor.workers // folder_workers)
+    with ProcessPoolExecutor(max_workers=folder_workers) as executor:
+        yield from executor.map(
+            _process_folder_job, repeat(processor), folders, repeat(inner_workers)
+        )
+
+def worker_daemon() -> ExifToolDaemon:
+    """
+    Get the ExifTool daemon of the current pool worker
+
+    Returns:
+        ExifToolDaemon: Daemon started by init_worker_daemon
+    """
+    if _worker_daemon is None:
+        raise RuntimeError("ExifTool worker daemon has not been initialized")
+    return _worker_daemon
@@ -1,13 +1,17 @@
 import os
-import subprocess
 import shutil
-import tempfile
 import argparse
-import sys
-from datetime import datetime
+import csv
+import multiprocessing
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import orjson
 from tqdm import tqdm
+from exiftool_daemon import (
+    ExifToolDaemon, exiftool_available, find_exiftool, init_worker_daemon, map_folders,
+    worker_daemon
+)
 
 """
 DJI Image Metadata Extraction Tool
@@ -30,93 +34,159 @@ Supported Devices:
 - M4T (newly added)
 """
 
-class MetadataProcessor:
-    """Image metadata processor"""
+TAG_KEYWORD_PATTERN = re.compile(r'dji|gps|image|rtk|thermal', re.IGNORECASE)
 
-    def __init__(self):
-        """Initialize processor"""
-        self.temp_dir = self._create_temp_dir()
-        self.all_tags = set(['ImageName'])
+# Let ExifTool select the keyword tags itself (tag-name wildcards are case
+# insensitive and match in every group, MakerNotes included) instead of
+# serializing every tag to JSON; this exports the same tags and values as
+# filtering the full "-j -G -a" output. TAG_KEYWORD_PATTERN stays as a
+# safety net on the returned tags.
+EXIFTOOL_READ_ARGS = [
+    "-j", "-G", "-a",
+    "-*dji*", "-*gps*", "-*image*", "-*rtk*", "-*thermal*"
+]
 
-        self.exiftool_path = self._find_exiftool()
+SKIP_TAGS = frozenset([
+    'SourceFile', 'Directory', 'FileSize',
+    'FileModifyDate', 'FileAccessDate',
+    'FileInodeChangeDate'
+])
 
-        self._check_exiftool()
+def _filter_metadata(jpg_name: str, tags: Dict[str, object]) -> Optional[Dict[str, str]]:
+    """
+    Keep only the tags relevant for DJI thermal processing
+
+    Args:
+        jpg_name: JPG file name
+        tags: Tags of one image as returned by ExifTool (-j -G)
+
+    Returns:
+        Optional[Dict[str, str]]: Filtered metadata dictionary, returns None if no tag matches
+    """
+    metadata = {'ImageName': jpg_name}
+
+    for tag_full_name, value in tags.items():
+        if ":" in tag_full_name:
+            group, tag = tag_full_name.split(":", 1)
+
+            if tag_full_name in SKIP_TAGS:
+                continue
+
+            if TAG_KEYWORD_PATTERN.search(tag):
+                full_tag = f"{group}.{tag}"
+
+                str_value = str(value).lstrip('+')
+                metadata[full_tag] = str_value
+
+    if len(metadata) <= 1:
+        print(f"Warning: No matching metadata found in {jpg_name}")
+        return None
+
+    return metadata
+
+def _move_file(source: Path, target: Path) -> None:
+    """
+    Move a file, renaming it in place when source and target share a file system
+
+    Args:
+        source: Source file path
+        target: Target file path
+    """
+    try:
+        # input_dir and other are created inside the image folder, so this is
+        # a single rename without the extra checks of shutil.move
+        os.rename(source, target)
+    except OSError:
+        # e.g. a different file system: shutil.move copies the data in the
+        # kernel (sendfile) where available
+        shutil.move(str(source), str(target))
+
+def _scan_jpg_files(directory: Path, extensions: Tuple[str, ...] = ('.jpg',)) -> List[Path]:
+    """
+    List JPG files of a directory in a single scandir pass
+
+    Args:
+        directory: Directory to scan
+        extensions: Lower-case file extensions to accept
+
+    Returns:
+        List[Path]: JPG file paths (extension matched case insensitively)
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith(extensions) and entry.is_file()
+        ]
+
+def _parse_image_output(jpg_name: str, output: bytes) -> Optional[Dict[str, str]]:
+    """
+    Parse the ExifTool JSON output of one JPG file
+
+    Args:
+        jpg_name: JPG file name
+        output: Raw ExifTool -j output of a command reading this file only
+
+    Returns:
+        Optional[Dict[str, str]]: Extracted metadata dictionary, returns None if extraction fails
+    """
+    try:
+        data = orjson.loads(output)
+    except Exception as e:
+        print(f"Error: Error occurred while processing {jpg_name} ({str(e)})")
+        return None
+
+    if not data:
+        print(f"Warning: No metadata found in {jpg_name}")
+        return None
+
+    return _filter_metadata(jpg_name, data[0])
+
+def _worker_extract(jpg_path: str) -> Optional[Dict[str, str]]:
+    """
+    Extract metadata of one JPG file inside a pool worker
 
-    def _find_exiftool(self) -> str:
+    Args:
+        jpg_path: JPG file path
+
+    Returns:
+        Optional[Dict[str, str]]: Extracted metadata dictionary, returns None if extraction fails
+    """
+    jpg_name = Path(jpg_path).name
+    try:
+        output = worker_daemon().execute_raw(EXIFTOOL_READ_ARGS + [jpg_path])
+    except Exception as e:
+        print(f"Error: Error occurred while processing {jpg_name} ({str(e)})")
+        return None
+
+    return _parse_image_output(jpg_name, output)
+
+class MetadataProcessor:
+    """Image metadata processor"""
+
+    def __init__(self, workers: Optional[int] = None):
         """
-        Locate ExifTool executable path
+        Initialize processor
 
-        Returns:
-            str: Path to ExifTool executable
+        Args:
+            workers: Number of parallel ExifTool workers, default is CPU count
         """
-        root_dir = Path(__file__).resolve().parent
-
-        exiftool_dir = root_dir / "exiftool-13.29_64"
-        exiftool_windows = exiftool_dir / "exiftool.exe"
-        exiftool_unix = exiftool_dir / "exiftool"
-        exiftool_asset = (
-            root_dir / "Thermal-Tools-main" / "assets" /
-            "linux" / "exiftool" / "exiftool"
-        )
-        exiftool_packages = sorted(
-            exiftool_dir.glob("Image-ExifTool-*/exiftool"),
-            reverse=True
-        )
+        self.workers = workers or os.cpu_count() or 1
+        self.all_tags = set(['ImageName'])
 
-        if sys.platform.startswith("win"):
-            if exiftool_windows.exists():
-                return str(exiftool_windows)
-        else:
-            if exiftool_unix.exists():
-                exiftool_unix.chmod(0o755)
-                return str(exiftool_unix)
-            for pkg_exe in exiftool_packages:
-                pkg_exe.chmod(0o755)
-                return str(pkg_exe)
-            if exiftool_asset.exists():
-                exiftool_asset.chmod(0o755)
-                return str(exiftool_asset)
-            if exiftool_windows.exists():
-                exiftool_windows.chmod(0o755)
-                return str(exiftool_windows)
-
-        return "exiftool.exe" if sys.platform.startswith("win") else "exiftool"
+        self.exiftool_path = find_exiftool()
+
+        self._check_exiftool()
+        self.daemon = ExifToolDaemon(self.exiftool_path)
 
     def _check_exiftool(self) -> None:
         """Check if ExifTool is available"""
-        try:
-            subprocess.run(
-                [self.exiftool_path, "-ver"],
-                capture_output=True,
-                check=True
-            )
-            print(f"ExifTool successfully detected: {self.exiftool_path}")
-        except (subprocess.SubprocessError, FileNotFoundError):
+        if not exiftool_available(self.exiftool_path):
             error_msg = (
                 "Error: ExifTool not found or cannot run."
                 "Please ensure ExifTool is properly installed and added to system path."
             )
             raise RuntimeError(error_msg)
-
-    def _create_temp_dir(self) -> Path:
-        """
-        Create temporary working directory
-
-        Returns:
-            Path: Temporary directory path
-        """
-        try:
-            temp_base = Path(tempfile.gettempdir())
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            temp_dir = temp_base / f'metadata_process_{timestamp}'
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            return temp_dir
-        except Exception as e:
-            print(f"Warning: Cannot use system temporary directory ({str(e)})")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            fallback_dir = Path.cwd() / f'temp_metadata_{timestamp}'
-            fallback_dir.mkdir(parents=True, exist_ok=True)
-            return fallback_dir
+        print(f"ExifTool successfully detected: {self.exiftool_path}")
 
     def extract_metadata(self, jpg_path: Union[str, Path]) -> Optional[Dict[str, str]]:
         """
@@ -128,61 +198,79 @@ class MetadataProcessor:
         Returns:
             Optional[Dict[str, str]]: Extracted metadata dictionary, returns None if extraction fails
         """
-        temp_jpg = None
+        results = list(self.iter_metadata([jpg_path]))
+        return results[0] if results else None
+
+    def iter_metadata(
+        self, jpg_paths: List[Union[str, Path]]
+    ) -> Iterator[Optional[Dict[str, str]]]:
+        """
+        Extract metadata file by file, streaming one ExifTool command per image
+        through the daemon so that results are available as soon as each image
+        has been read
+
+        Args:
+            jpg_paths: JPG file paths
+
+        Yields:
+            Optional[Dict[str, str]]: Extracted metadata dictionary of each file in
+                                      input order, None if extraction fails
+        """
+        jpg_paths = [str(jpg_path) for jpg_path in jpg_paths]
+        commands = (EXIFTOOL_READ_ARGS + [jpg_path] for jpg_path in jpg_paths)
+
         try:
-            jpg_path = Path(jpg_path)
-            temp_jpg = self.temp_dir / f"temp_{jpg_path.name}"
-            
-            shutil.copy2(str(jpg_path), str(temp_jpg))
-            
-            cmd = [self.exiftool_path, "-j", "-G", "-a", str(temp_jpg)]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            
-            import json
-            data = json.loads(result.stdout)
-            if not data or len(data) == 0:
-                print(f"Warning: No metadata found in {jpg_path.name}")
-                return None
-            
-            metadata = {'ImageName': jpg_path.name}
-            
-            keywords = ['dji', 'gps', 'image', 'rtk', 'thermal']
-            
-            for tag_full_name, value in data[0].items():
-                if ":" in tag_full_name:
-                    group, tag = tag_full_name.split(":", 1)
-                    tag_lower = tag.lower()
-
-                    skip_tags = [
-                        'SourceFile', 'Directory', 'FileSize',
-                        'FileModifyDate', 'FileAccessDate',
-                        'FileInodeChangeDate'
-                    ]
-                    if tag_full_name in skip_tags:
-                        continue
-                    
-                    if any(keyword in tag_lower for keyword in keywords):
-                        full_tag = f"{group}.{tag}"
-                        
-                        str_value = str(value).lstrip('+')
-                        metadata[full_tag] = str_value
-                        self.all_tags.add(full_tag)
-            
-            if len(metadata) <= 1:
-                print(f"Warning: No matching metadata found in {jpg_path.name}")
-                return None
-                
-            return metadata
-                
+            outputs = self.daemon.execute_many(commands, raw=True)
+            for jpg_path, output in zip(jpg_paths, outputs):
+                metadata = _parse_image_output(Path(jpg_path).name, output)
+                if metadata:
+                    self.all_tags.update(metadata)
+                yield metadata
         except Exception as e:
-            print(f"Error: Error occurred while processing {jpg_path.name} ({str(e)})")
-            return None
+            print(f"Error: Error occurred while extracting metadata ({str(e)})")
+
+    def _extract_folder_metadata(self, jpg_files: List[Path]) -> List[Dict[str, str]]:
+        """
+        Extract metadata from JPG files, using a pool of ExifTool workers for large folders
+
+        Args:
+            jpg_files: JPG file paths
+
+        Returns:
+            List[Dict[str, str]]: Extracted metadata dictionaries in input order
+        """
+        workers = min(self.workers, len(jpg_files))
+        if workers <= 1:
+            results = self.iter_metadata(jpg_files)
+            return [
+                metadata for metadata in tqdm(results, total=len(jpg_files),
+                                              desc="Extracting metadata", mininterval=1.0)
+                if metadata
+            ]
+
+        order = {jpg_file.name: index for index, jpg_file in enumerate(jpg_files)}
+        all_metadata = []
+
+        pool = multiprocessing.Pool(
+            workers,
+            initializer=init_worker_daemon,
+            initargs=(self.exiftool_path,)
+        )
+        try:
+            results = pool.imap_unordered(
+                _worker_extract, [str(f) for f in jpg_files], chunksize=8
+            )
+            for metadata in tqdm(results, total=len(jpg_files),
+                                 desc="Extracting metadata", mininterval=1.0):
+                if metadata:
+                    self.all_tags.update(metadata)
+                    all_metadata.append(metadata)
         finally:
-            if temp_jpg and temp_jpg.exists():
-                try:
-                    temp_jpg.unlink()
-                except Exception:
-                    pass
+            pool.close()
+            pool.join()
+
+        all_metadata.sort(key=lambda metadata: order[metadata['ImageName']])
+        return all_metadata
 
     def save_to_txt(
         self, data: List[Dict[str, str]], folder_path: Union[str, Path]
@@ -199,19 +287,17 @@ class MetadataProcessor:
 
         output_path = Path(folder_path) / "metadata.txt"
 
-        other_tags = sorted(list(self.all_tags - {'ImageName'}))
+        other_tags = sorted(self.all_tags - {'ImageName'})
         fieldnames = ['ImageName'] + other_tags
 
         print(f"\nNumber of tags found: {len(fieldnames)}")
         
-        with output_path.open('w', encoding='utf-8') as txtfile:
-            txtfile.write(','.join(fieldnames) + '\n')
-            
-            for row in data:
-                values = []
-                for field in fieldnames:
-                    values.append(str(row.get(field, '')))
-                txtfile.write(','.join(values) + '\n')
+        with output_path.open('w', encoding='utf-8', newline='') as txtfile:
+            writer = csv.DictWriter(
+                txtfile, fieldnames=fieldnames, extrasaction='ignore', lineterminator='\n'
+            )
+            writer.writeheader()
+            writer.writerows(data)
         
         print(f"Generated: {output_path}")
 
@@ -233,9 +319,10 @@ class MetadataProcessor:
             return subfolders
         
         try:
-            for item in base_dir.iterdir():
-                if item.is_dir():
-                    subfolders.append(item)
+            with os.scandir(base_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(Path(entry.path))
         except Exception as e:
             print(f"Warning: Error occurred while searching folders ({str(e)})")
         
@@ -253,6 +340,10 @@ class MetadataProcessor:
         if not folder_path.is_dir():
             print(f"Error: {folder_path} is not a valid directory")
             return
+
+        # metadata.txt only gets the columns of its own folder, whichever
+        # process (and previous folders) this folder is processed by
+        self.all_tags = set(['ImageName'])
         
         other_dir = folder_path / "other"
         if not other_dir.exists():
@@ -262,9 +353,7 @@ class MetadataProcessor:
         if not input_dir.exists():
             input_dir.mkdir(parents=True, exist_ok=True)
             
-        jpg_files_lower = list(input_dir.glob('*.jpg'))
-        jpg_files_upper = list(input_dir.glob('*.JPG'))
-        existing_input_files = jpg_files_lower + jpg_files_upper
+        existing_input_files = _scan_jpg_files(input_dir)
         if existing_input_files:
             msg = (
                 f"Detected {len(existing_input_files)} JPG files already existing in input directory {input_dir}, "
@@ -275,13 +364,7 @@ class MetadataProcessor:
             total_imgs = len(jpg_files)
             print(f"Processing {total_imgs} thermal photos in {folder_path.name}")
             
-            all_metadata = []
-            
-            with tqdm(jpg_files, desc="Extracting metadata", mininterval=1.0) as pbar:
-                for jpg_file in pbar:
-                    metadata = self.extract_metadata(jpg_file)
-                    if metadata:
-                        all_metadata.append(metadata)
+            all_metadata = self._extract_folder_metadata(jpg_files)
             
             if all_metadata:
                 print(f"\nExtracted metadata from {len(all_metadata)}/{total_imgs} files")
@@ -290,10 +373,7 @@ class MetadataProcessor:
                 print(f"Warning: Unable to extract metadata from any image in {folder_path.name}.")
             return
         
-        jpg_files = []
-        for item in folder_path.iterdir():
-            if item.is_file() and item.suffix.lower() in ['.jpg', '.jpeg']:
-                jpg_files.append(item)
+        jpg_files = _scan_jpg_files(folder_path, ('.jpg', '.jpeg'))
         
         if not jpg_files:
             print(f"Warning: No JPG files found in {folder_path}")
@@ -323,7 +403,7 @@ class MetadataProcessor:
                     try:
                         target_path = other_dir / file.name
                         if not target_path.exists():
-                            shutil.move(str(file), str(target_path))
+                            _move_file(file, target_path)
                             moved_count += 1
                         else:
                             print(f"Skipping existing file: {file.name}")
@@ -343,7 +423,7 @@ class MetadataProcessor:
                 try:
                     target_path = input_dir / file.name
                     if not target_path.exists():
-                        shutil.move(str(file), str(target_path))
+                        _move_file(file, target_path)
                         moved_count += 1
                     else:
                         print(f"Skipping existing file: {file.name}")
@@ -351,7 +431,7 @@ class MetadataProcessor:
                     print(f"Warning: Failed to move file {file.name}: {str(e)}")
         print(f"Successfully moved {moved_count} thermal photos")
                 
-        jpg_files = list(input_dir.glob('*.jpg')) + list(input_dir.glob('*.JPG'))
+        jpg_files = _scan_jpg_files(input_dir)
             
         total_imgs = len(jpg_files)
         if total_imgs == 0:
@@ -360,13 +440,7 @@ class MetadataProcessor:
             
         print(f"Processing {total_imgs} thermal photos in {folder_path.name}")
         
-        all_metadata = []
-        
-        with tqdm(jpg_files, desc="Extracting metadata", mininterval=1.0) as pbar:
-            for jpg_file in pbar:
-                metadata = self.extract_metadata(jpg_file)
-                if metadata:
-                    all_metadata.append(metadata)
+        all_metadata = self._extract_folder_metadata(jpg_files)
         
         if all_metadata:
             print(f"\nExtracted metadata from {len(all_metadata)}/{total_imgs} files")
@@ -395,18 +469,12 @@ class MetadataProcessor:
                 return
                 
             print(f"Found {len(subfolders)} subfolders")
-            
-            for folder in subfolders:
-                self.process_folder(folder)
+            list(map_folders(self, subfolders))
             
         except Exception as e:
             print(f"Error: {str(e)}")
         finally:
-            try:
-                if self.temp_dir.exists():
-                    shutil.rmtree(self.temp_dir)
-            except Exception as e:
-                print(f"Warning: Failed to clean up temporary files ({str(e)})")
+            self.daemon.close()
 
 def main():
     """Main function"""
@@ -414,10 +482,14 @@ def main():
     parser.add_argument("-d", "--directory",
                       default="main",
                       help="Specify the root directory path to process (default: 'main')")
+    parser.add_argument("-j", "--workers",
+                      type=int,
+                      default=None,
+                      help="Number of parallel ExifTool workers (default: CPU count)")
     
     args = parser.parse_args()
     
-    processor = MetadataProcessor()
+    processor = MetadataProcessor(args.workers)
     processor.process_all(args.directory)
 
 if __name__ == "__main__":
@@ -1,11 +1,18 @@
+import io
 import os
 import shutil
 import platform
 import subprocess
 import argparse
+import ctypes
+import functools
+import multiprocessing
 import stat
-from typing import Any
-from PIL import Image
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image, TiffImagePlugin
 import piexif
 from tqdm import tqdm
 import numpy as np
@@ -29,22 +36,343 @@ Supported Devices:
 - M4T
 """
 
+# Per-process buffers reused for the RAW bytes and temperature data of every image
+_raw_buffer: Optional[bytearray] = None
+_scratch_buffer: Optional[np.ndarray] = None
+_tiff_buffer: Optional[io.BytesIO] = None
+
+def _read_raw_file(raw_path: str) -> np.ndarray:
+    """
+    Read a RAW file into the reusable per-process buffer and delete it
+
+    Args:
+        raw_path: RAW file path
+
+    Returns:
+        np.ndarray: int16 view of the file data (valid until the next call)
+    """
+    global _raw_buffer
+    with open(raw_path, 'rb', buffering=0) as raw_file:
+        size = os.fstat(raw_file.fileno()).st_size
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(raw_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        if _raw_buffer is None or len(_raw_buffer) < size:
+            _raw_buffer = bytearray(size)
+        view = memoryview(_raw_buffer)[:size]
+
+        read = 0
+        while read < size:
+            count = raw_file.readinto(view[read:])
+            if not count:
+                raise OSError(f"Unexpected end of RAW file: {raw_path}")
+            read += count
+
+    # The RAW is only needed once; removing it also drops its cached pages
+    os.unlink(raw_path)
+    return np.frombuffer(view, dtype='<i2')
+
+@functools.lru_cache(maxsize=1)
+def _raw_temp_root() -> Optional[str]:
+    """
+    Get the directory that holds the temporary RAW files (checked once per process)
+
+    Returns:
+        Optional[str]: /dev/shm if it is a usable tmpfs, None for the system
+                       temporary directory
+    """
+    shm_dir = "/dev/shm"
+    try:
+        # RAW files are deleted as soon as they are read, so only a few of
+        # them exist at a time and a small tmpfs is enough
+        if shutil.disk_usage(shm_dir).free >= 64 * 1024 * 1024 and os.access(shm_dir, os.W_OK):
+            return shm_dir
+    except OSError:
+        pass
+    return None
+
+def _get_scratch_buffer(size: int) -> np.ndarray:
+    """
+    Get a float32 buffer of at least `size` elements, reusing the previous one
+
+    Args:
+        size: Number of elements needed
+
+    Returns:
+        np.ndarray: Flat float32 view of exactly `size` elements
+    """
+    global _scratch_buffer
+    if _scratch_buffer is None or _scratch_buffer.size < size:
+        _scratch_buffer = np.empty(size, dtype=np.float32)
+    return _scratch_buffer[:size]
+
+def _save_tiff(image: Image.Image, output_path: str, **params: Any) -> None:
+    """
+    Encode an image as TIFF in the reusable per-process buffer and write it at once
+
+    Args:
+        image: Image to save
+        output_path: TIFF output path
+        **params: TIFF encoder options passed to Image.save
+    """
+    global _tiff_buffer
+    if _tiff_buffer is None:
+        _tiff_buffer = io.BytesIO()
+    _tiff_buffer.seek(0)
+    _tiff_buffer.truncate()
+    image.save(_tiff_buffer, format='TIFF', **params)
+
+    with _tiff_buffer.getbuffer() as data, open(output_path, 'wb', buffering=0) as tiff_file:
+        written = 0
+        while written < len(data):
+            written += tiff_file.write(data[written:])
+
+DIRP_SUCCESS = 0
+
+class _DirpResolution(ctypes.Structure):
+    """dirp_resolution_t of the DJI Thermal SDK API"""
+    _fields_ = [("width", ctypes.c_int32), ("height", ctypes.c_int32)]
+
+@functools.lru_cache(maxsize=None)
+def _load_dirp_library(lib_dirs: Tuple[str, ...]) -> Optional[ctypes.CDLL]:
+    """
+    Load the DJI Thermal SDK library (libdirp) into this process (once per process)
+
+    Args:
+        lib_dirs: SDK library directories, the first one containing libdirp
+
+    Returns:
+        Optional[ctypes.CDLL]: Loaded library, returns None if it is not available
+    """
+    is_windows = platform.system() == "Windows"
+    lib_path = Path(lib_dirs[0]) / ("libdirp.dll" if is_windows else "libdirp.so")
+    if not lib_path.exists():
+        return None
+
+    try:
+        if is_windows:
+            for lib_dir in lib_dirs:
+                os.add_dll_directory(lib_dir)
+        else:
+            # libdirp opens its camera specific libv_*.so by full path, but
+            # their own dependencies are only searched in LD_LIBRARY_PATH, which
+            # cannot change for a running process. Load them globally first.
+            pending = [
+                lib for lib_dir in lib_dirs for lib in Path(lib_dir).glob("lib*.so*")
+                if not lib.name.startswith(("libdirp", "libv_"))
+            ]
+            while pending:
+                failed = []
+                for lib in pending:
+                    try:
+                        ctypes.CDLL(str(lib), mode=ctypes.RTLD_GLOBAL)
+                    except OSError:
+                        failed.append(lib)
+                if len(failed) == len(pending):
+                    break
+                pending = failed
+
+        library = ctypes.CDLL(str(lib_path))
+    except OSError as e:
+        print(f"Warning: Unable to load DJI SDK library, using SDK executable instead ({str(e)})")
+        return None
+
+    library.dirp_create_from_rjpeg.argtypes = [
+        ctypes.c_char_p, ctypes.c_int32, ctypes.POINTER(ctypes.c_void_p)
+    ]
+    library.dirp_create_from_rjpeg.restype = ctypes.c_int32
+    library.dirp_destroy.argtypes = [ctypes.c_void_p]
+    library.dirp_destroy.restype = ctypes.c_int32
+    library.dirp_get_rjpeg_resolution.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(_DirpResolution)
+    ]
+    library.dirp_get_rjpeg_resolution.restype = ctypes.c_int32
+    library.dirp_measure.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(ctypes.c_int16), ctypes.c_int32
+    ]
+    library.dirp_measure.restype = ctypes.c_int32
+    library.dirp_set_verbose_level.argtypes = [ctypes.c_int]
+    library.dirp_set_verbose_level.restype = None
+    library.dirp_set_verbose_level(0)
+
+    return library
+
+def _measure_with_dirp(library: ctypes.CDLL, input_path: str, raw_path: str) -> bool:
+    """
+    Write the temperature RAW of an R-JPEG with the in-process SDK library
+
+    Produces the same file as `dji_irp -a measure` (int16, 0.1 degree Celsius
+    per LSB) without starting an SDK process per image.
+
+    Args:
+        library: Library returned by _load_dirp_library
+        input_path: R-JPEG image path
+        raw_path: RAW output path
+
+    Returns:
+        bool: True if successful, False if the SDK rejected the image
+    """
+    with open(input_path, 'rb') as image_file:
+        data = image_file.read()
+
+    handle = ctypes.c_void_p()
+    if library.dirp_create_from_rjpeg(data, len(data), ctypes.byref(handle)) != DIRP_SUCCESS:
+        return False
+
+    try:
+        resolution = _DirpResolution()
+        if library.dirp_get_rjpeg_resolution(handle, ctypes.byref(resolution)) != DIRP_SUCCESS:
+            return False
+
+        temperature = np.empty(resolution.width * resolution.height, dtype=np.int16)
+        temperature_ptr = temperature.ctypes.data_as(ctypes.POINTER(ctypes.c_int16))
+        if library.dirp_measure(handle, temperature_ptr, temperature.nbytes) != DIRP_SUCCESS:
+            return False
+    finally:
+        library.dirp_destroy(handle)
+
+    temperature.tofile(raw_path)
+    return True
+
+# EXIF layout written to every TIFF: only GPS and the thumbnail are taken
+# from the original image, all other IFDs stay empty
+_EXIF_TEMPLATE = {
+    '0th': {},
+    'Exif': {},
+    'GPS': {},
+    'Interop': {},
+    '1st': {},
+    'thumbnail': None
+}
+
+def _build_exif_bytes(exif_dict: Dict[str, Any]) -> bytes:
+    """
+    Build the EXIF block of a TIFF from the EXIF data of its original image
+
+    Args:
+        exif_dict: piexif EXIF dictionary of the original image
+
+    Returns:
+        bytes: EXIF block with the GPS data and thumbnail of the original image
+    """
+    new_exif = dict(_EXIF_TEMPLATE, GPS=exif_dict['GPS'], thumbnail=exif_dict['thumbnail'])
+    return piexif.dump(new_exif)
+
+def _build_int16_tiffinfo(exif_bytes: bytes) -> Image.Exif:
+    """
+    Build the TIFF tags of an int16_output TIFF
+
+    Pillow ignores `exif` when `tiffinfo` is given, so the EXIF block is
+    loaded into the tags together with SampleFormat = signed integer.
+
+    Args:
+        exif_bytes: EXIF block built by _build_exif_bytes
+
+    Returns:
+        Image.Exif: Tags to pass as `tiffinfo`
+    """
+    tiffinfo = Image.Exif()
+    tiffinfo.load(exif_bytes)
+    tiffinfo[TiffImagePlugin.SAMPLEFORMAT] = 2
+    return tiffinfo
+
+# Start-of-frame markers (SOF0-SOF15 without DHT, JPG and DAC), which hold the image size
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _jpeg_size(image_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Read the size of a JPEG image from its start-of-frame marker
+
+    Only the segment headers are read: the segments in front of the frame
+    (e.g. the large thermal APP segments of an R-JPEG) are skipped with seeks.
+
+    Args:
+        image_path: JPEG image path
+
+    Returns:
+        Optional[Tuple[int, int]]: (width, height), None if no frame header was found
+    """
+    with open(image_path, 'rb') as image_file:
+        if image_file.read(2) != b'\xff\xd8':
+            return None
+        while True:
+            header = image_file.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return None
+            marker = header[1]
+            if marker == 0xFF:
+                # Fill byte in front of the marker
+                image_file.seek(-3, os.SEEK_CUR)
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                frame = image_file.read(5)
+                if len(frame) < 5:
+                    return None
+                height = int.from_bytes(frame[1:3], 'big')
+                width = int.from_bytes(frame[3:5], 'big')
+                return (width, height) if width and height else None
+            if marker == 0xDA:
+                # Start of scan without a frame header
+                return None
+            image_file.seek(int.from_bytes(header[2:4], 'big') - 2, os.SEEK_CUR)
+
+def _factor_to_aspect(pixels: int, ratio: float) -> Tuple[int, int]:
+    """
+    Split a pixel count into width x height close to an aspect ratio
+
+    The height is the largest divisor of `pixels` not above the height that
+    the aspect ratio would give, found in one vectorized pass.
+
+    Args:
+        pixels: Number of pixels
+        ratio: Target width / height ratio
+
+    Returns:
+        Tuple[int, int]: (width, height)
+    """
+    max_height = max(1, int(np.sqrt(pixels / ratio)))
+    heights = np.arange(1, max_height + 1)
+    height = int(heights[pixels % heights == 0][-1])
+    return pixels // height, height
+
 class ImageProcessor:
     """Image processor"""
 
     INPUT_DIR_NAME = "input_dir"
     OUTPUT_DIR_NAME = "out_dir"
-    TEMP_DIR_NAME = "temp_dir"
 
     SUPPORTED_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
 
-    def __init__(self):
-        """Initialize processor and determine running platform"""
+    # (rgb_width, rgb_height, raw_pixels) -> (thermal_width, thermal_height)
+    _thermal_size_cache: Dict[Tuple[int, int, int], Tuple[int, int]] = {}
+
+    def __init__(
+        self, workers: Optional[int] = None, int16_output: bool = False,
+        sdk_library: bool = False
+    ):
+        """
+        Initialize processor and determine running platform
+
+        Args:
+            workers: Number of parallel conversion processes, default is CPU count
+            int16_output: Write 16-bit signed TIFFs in 0.1°C units instead of
+                          32-bit float TIFFs in °C
+            sdk_library: Measure temperatures with the SDK library loaded in-process
+                         instead of running the SDK executable per image (experimental)
+        """
         self.platform = platform.system()
+        self.workers = workers or os.cpu_count() or 1
+        self.int16_output = int16_output
+        self.sdk_library = sdk_library
 
         self.sdk_path = self._get_sdk_path()
         self._ensure_sdk_executable()
         print(f"DJI Thermal SDK path: {self.sdk_path}")
+
+        # Constant for every SDK call, so resolved once instead of per image
+        self._sdk_lib_dirs = tuple(self._sdk_library_dirs())
+        self._child_env = self._build_child_env()
+
     def _get_sdk_path(self) -> str:
         """
         Get DJI SDK executable path
@@ -108,17 +436,23 @@ class ImageProcessor:
         if not os.path.exists(parent_dir):
             raise FileNotFoundError(f"Parent directory not found: {parent_dir}")
 
-        subfolders = [f for f in os.listdir(parent_dir)
-                     if os.path.isdir(os.path.join(parent_dir, f))]
+        with os.scandir(parent_dir) as entries:
+            subfolders = [
+                entry.path for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+            ]
         
         if not subfolders:
             print(f"No subfolders found in {parent_dir}")
             return
             
-        for subfolder in subfolders:
-            subfolder_path = os.path.join(parent_dir, subfolder)
-            print(f"\nProcessing: {subfolder}")
-            self._process_single_folder(subfolder_path)
+        for subfolder_path in subfolders:
+            self.process_folder(subfolder_path)
+
+    def process_folder(self, folder_path: str) -> None:
+        """Convert the thermal images of a single folder"""
+        print(f"\nProcessing: {os.path.basename(folder_path)}")
+        self._process_single_folder(folder_path)
 
     def _process_single_folder(self, folder_path: str) -> None:
         """Process a single thermal folder"""
@@ -127,12 +461,18 @@ class ImageProcessor:
             print(f"Warning: Input directory not found {input_dir}, creating empty directory")
             os.makedirs(input_dir)
             
-        output_dir = self._create_directory(folder_path, self.OUTPUT_DIR_NAME)
-        temp_dir = self._create_directory(folder_path, self.TEMP_DIR_NAME)
+        output_dir, cleanup = self._create_directory(folder_path, self.OUTPUT_DIR_NAME)
+        # The RAW files never need to reach the disk: keep them in memory
+        # (tmpfs) where available
+        temp_dir = tempfile.mkdtemp(prefix="dji_raw_", dir=_raw_temp_root())
 
         try:
-            image_files = [f for f in os.listdir(input_dir) 
-                          if f.lower().endswith(self.SUPPORTED_IMAGE_EXTENSIONS)]
+            with os.scandir(input_dir) as entries:
+                image_files = [
+                    entry.name for entry in entries
+                    if entry.name.lower().endswith(self.SUPPORTED_IMAGE_EXTENSIONS)
+                    and entry.is_file()
+                ]
                           
             if not image_files:
                 print(f"Warning: No image files found in {input_dir}")
@@ -143,169 +483,331 @@ class ImageProcessor:
             first_file_stem = os.path.splitext(first_file)[0]
             first_raw_path = os.path.join(temp_dir, f"{first_file_stem}.raw")
 
-            devnull = subprocess.DEVNULL
-
-            self._convert_with_dji_sdk(first_input_path, first_raw_path, devnull)
+            self._convert_with_dji_sdk(first_input_path, first_raw_path)
 
-            with Image.open(first_input_path) as img:
-                width, height = img.size
+            first_exif, (width, height) = self._read_image_info(first_input_path)
 
-            img_data = np.fromfile(first_raw_path, dtype='int16')
-            actual_pixels = img_data.size
+            actual_pixels = os.path.getsize(first_raw_path) // 2
 
             if actual_pixels != width * height:
-                ratio = width / height
-                new_height = int(np.sqrt(actual_pixels / ratio))
-                new_width = int(actual_pixels / new_height)
-
-                while new_width * new_height != actual_pixels:
-                    new_height -= 1
-                    new_width = int(actual_pixels / new_height)
-
+                new_width, new_height = self._thermal_size(width, height, actual_pixels)
                 msg = (
                     f"Note: Thermal data size({new_width}x{new_height})"
                     f"differs from RGB image size({width}x{height})"
                 )
                 print(msg)
-                thermal_width, thermal_height = new_width, new_height
-                ImageProcessor._last_thermal_size = (
-                    thermal_width, thermal_height
-                )
 
-            first_output = os.path.join(
-                output_dir, f"{os.path.splitext(first_file)[0]}.tiff"
+            first_output = os.path.join(output_dir, f"{first_file_stem}.tiff")
+            self._process_raw_image(
+                first_raw_path, first_output, (width, height), first_exif
             )
-            self._process_raw_image(first_raw_path, first_output, first_input_path)
             
             remaining_files = image_files[1:]
             total_count = len(image_files)
             processed_count = 1
+            workers = min(self.workers, len(remaining_files))
             
             with tqdm(total=total_count, initial=processed_count, desc="Conversion progress", mininterval=1.0) as pbar:
+                # Local aliases: these loops run once per image
+                join = os.path.join
+                splitext = os.path.splitext
+                jobs = []
+                add_job = jobs.append
                 for filename in remaining_files:
-                    input_path = os.path.join(input_dir, filename)
-                    raw_path = os.path.join(temp_dir, f"{os.path.splitext(filename)[0]}.raw")
-                    output_path = os.path.join(output_dir, f"{os.path.splitext(filename)[0]}.tiff")
-                    
-                    self._convert_with_dji_sdk(input_path, raw_path, devnull)
-                    self._process_raw_image(raw_path, output_path, input_path)
-                    pbar.update(1)
+                    stem = splitext(filename)[0]
+                    add_job((
+                        join(input_dir, filename),
+                        join(temp_dir, f"{stem}.raw"),
+                        join(output_dir, f"{stem}.tiff")
+                    ))
+
+                if workers > 1:
+                    # Forking after the in-process SDK library (OpenMP) ran in
+                    # this process is not safe, so spawn workers in that case
+                    mp_context = multiprocessing.get_context("spawn") if self.sdk_library else None
+                    with ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=mp_context,
+                        initializer=_init_convert_worker,
+                        initargs=(self,)
+                    ) as executor:
+                        futures = [executor.submit(_convert_one, *job) for job in jobs]
+                        try:
+                            for future in as_completed(futures):
+                                future.result()
+                                pbar.update(1)
+                        except BaseException:
+                            # Stop at the first failed image instead of
+                            # converting the rest before reporting the error
+                            executor.shutdown(cancel_futures=True)
+                            raise
+                elif jobs:
+                    # Run the SDK for the next image in a thread while the
+                    # current one is read and encoded, so the SDK and the
+                    # TIFF encoding overlap instead of waiting on each other
+                    convert = self._convert_with_dji_sdk
+                    read_image_info = self._read_image_info
+                    process_raw_image = self._process_raw_image
+                    update = pbar.update
+                    last_index = len(jobs) - 1
+                    with ThreadPoolExecutor(max_workers=1) as sdk_thread:
+                        submit = sdk_thread.submit
+                        conversion = submit(convert, jobs[0][0], jobs[0][1])
+                        for index, (input_path, raw_path, output_path) in enumerate(jobs):
+                            conversion.result()
+                            if index < last_index:
+                                next_input, next_raw, _ = jobs[index + 1]
+                                conversion = submit(convert, next_input, next_raw)
+                            exif_dict, image_size = read_image_info(input_path)
+                            process_raw_image(raw_path, output_path, image_size, exif_dict)
+                            update(1)
         finally:
             if os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir)
+            if cleanup is not None:
+                cleanup.join()
+
+    def _create_directory(
+        self, parent_path: str, dir_name: str
+    ) -> Tuple[str, Optional[threading.Thread]]:
+        """
+        Create an empty directory, replacing an existing one
+
+        An existing directory (e.g. out_dir of a previous run with thousands
+        of TIFFs) is moved aside and deleted in a background thread, so that
+        processing does not wait for the deletion.
+
+        Args:
+            parent_path: Parent directory path
+            dir_name: Directory name
 
-    def _create_directory(self, parent_path: str, dir_name: str) -> str:
-        """Create directory, delete if already exists"""
+        Returns:
+            Tuple[str, Optional[threading.Thread]]: (directory path, thread
+                deleting the old directory, to be joined before returning)
+        """
         dir_path = os.path.join(parent_path, dir_name)
+        cleanup = None
         if os.path.exists(dir_path):
-            shutil.rmtree(dir_path)
+            stash_dir = tempfile.mkdtemp(prefix=f"{dir_name}.old.", dir=parent_path)
+            os.rename(dir_path, os.path.join(stash_dir, dir_name))
+            cleanup = threading.Thread(target=shutil.rmtree, args=(stash_dir,), daemon=True)
+            cleanup.start()
         os.makedirs(dir_path)
-        return dir_path
-
-    def _convert_with_dji_sdk(
-        self, input_path: str, raw_path: str, devnull: Any
-    ) -> None:
-        """Use DJI Thermal SDK to convert image"""
-        input_path_abs = str(Path(input_path).absolute())
-        raw_path_abs = str(Path(raw_path).absolute())
+        return dir_path, cleanup
 
-        sdk_cmd = (
-            f'"{self.sdk_path}" -s "{input_path_abs}" '
-            f'-a measure -o "{raw_path_abs}"'
-        )
+    def _sdk_library_dirs(self) -> List[str]:
+        """
+        Get the directories containing the DJI SDK libraries
 
+        Returns:
+            List[str]: SDK executable directory, followed by the tsdk-core library directory if present
+        """
         sdk_dir = Path(self.sdk_path).resolve().parent
         extra_lib_dir = (
             Path(__file__).resolve().parent /
             "tsdk-core" / "lib" / "linux" / "release_x64"
         )
 
-        env = os.environ.copy()
         lib_paths = [str(sdk_dir)]
         if extra_lib_dir.exists():
             lib_paths.append(str(extra_lib_dir))
+        return lib_paths
+
+    def _build_child_env(self) -> Dict[str, str]:
+        """
+        Build the environment of the SDK executable
+
+        Returns:
+            Dict[str, str]: Current environment with the SDK library directories on the library search path
+        """
+        env = os.environ.copy()
+        lib_paths = list(self._sdk_lib_dirs)
         existing = env.get("LD_LIBRARY_PATH")
         if existing:
             lib_paths.append(existing)
         env["LD_LIBRARY_PATH"] = ":".join(lib_paths)
 
         if self.platform == "Windows":
-            win_paths = [str(sdk_dir)]
+            win_paths = [self._sdk_lib_dirs[0]]
             existing_path = env.get("PATH")
             if existing_path:
                 win_paths.append(existing_path)
             env["PATH"] = ";".join(win_paths)
+
+        return env
+
+    def _convert_with_dji_sdk(self, input_path: str, raw_path: str) -> None:
+        """Use DJI Thermal SDK to convert image"""
+        input_path_abs = str(Path(input_path).absolute())
+        raw_path_abs = str(Path(raw_path).absolute())
+
+        # Opt-in: keep the SDK library resident in this process when it is
+        # shipped next to the executable. The executable remains the default
+        # and the fallback, as a crash inside it cannot take this process down.
+        if self.sdk_library:
+            library = _load_dirp_library(self._sdk_lib_dirs)
+            if library is not None and _measure_with_dirp(library, input_path_abs, raw_path_abs):
+                return
+
+        # Run the SDK directly instead of through a shell
+        sdk_cmd = [
+            self.sdk_path, "-s", input_path_abs,
+            "-a", "measure", "-o", raw_path_abs
+        ]
+        env = self._child_env
         
         if self.platform == "Windows":
             try:
                 subprocess.run(
                     sdk_cmd,
-                    shell=True,
-                    stdout=devnull,
-                    stderr=devnull,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
                     check=True,
                     env=env
                 )
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, OSError) as e:
                 print(f"Warning: SDK call failed: {e}")
         else:
             subprocess.run(
                 sdk_cmd,
-                shell=True,
-                stdout=devnull,
-                stderr=devnull,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 check=True,
                 env=env
             )
 
-    def _process_raw_image(self, raw_path: str, output_path: str, original_image_path: str) -> None:
+    def _read_image_info(self, image_path: str) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """
+        Read EXIF data and image size of the original image
+
+        Args:
+            image_path: Original image path
+
+        Returns:
+            Tuple[Dict[str, Any], Tuple[int, int]]: (piexif EXIF dictionary, (width, height))
+        """
+        exif_dict = piexif.load(image_path)
+        width = exif_dict['Exif'].get(piexif.ExifIFD.PixelXDimension)
+        height = exif_dict['Exif'].get(piexif.ExifIFD.PixelYDimension)
+
+        if not width or not height:
+            size = _jpeg_size(image_path)
+            if size is None:
+                with Image.open(image_path) as img:
+                    size = img.size
+            width, height = size
+
+        return exif_dict, (width, height)
+
+    def _thermal_size(self, width: int, height: int, actual_pixels: int) -> Tuple[int, int]:
+        """
+        Get the thermal data size when it differs from the RGB image size
+
+        Every image of a sensor has the same sizes, so the factorization is
+        computed once per (width, height, actual_pixels) and then reused.
+
+        Args:
+            width: RGB image width
+            height: RGB image height
+            actual_pixels: Number of pixels in the RAW thermal data
+
+        Returns:
+            Tuple[int, int]: (thermal_width, thermal_height)
+        """
+        key = (width, height, actual_pixels)
+        cached = self._thermal_size_cache.get(key)
+        if cached is not None:
+            return cached
+
+        thermal_size = _factor_to_aspect(actual_pixels, width / height)
+        self._thermal_size_cache[key] = thermal_size
+        return thermal_size
+
+    def _process_raw_image(
+        self, raw_path: str, output_path: str,
+        image_size: Tuple[int, int], exif_dict: Dict[str, Any]
+    ) -> None:
         """Process RAW format temperature data and save as TIFF"""
-        with Image.open(original_image_path) as img:
-            width, height = img.size
-        
-        img_data = np.fromfile(raw_path, dtype='int16')
+        width, height = image_size
+        img_data = _read_raw_file(raw_path)
         
         expected_pixels = width * height
         actual_pixels = img_data.size
         
-        if not hasattr(ImageProcessor, '_last_thermal_size'):
-            ImageProcessor._last_thermal_size = None
-        
         if actual_pixels != expected_pixels:
-            ratio = width / height
-            new_height = int(np.sqrt(actual_pixels / ratio))
-            new_width = int(actual_pixels / new_height)
-            
-            while new_width * new_height != actual_pixels:
-                new_height -= 1
-                new_width = int(actual_pixels / new_height)
-            
-            width, height = new_width, new_height
-
-        img_data = img_data.reshape(height, width) / 10
-
-        exif_dict = piexif.load(original_image_path)
-        new_exif = {
-            '0th': {},
-            'Exif': {},
-            'GPS': exif_dict['GPS'],
-            'Interop': {},
-            '1st': {},
-            'thumbnail': exif_dict['thumbnail']
-        }
-        exif_bytes = piexif.dump(new_exif)
+            width, height = self._thermal_size(width, height, actual_pixels)
+
+        exif_bytes = _build_exif_bytes(exif_dict)
+
+        if self.int16_output:
+            # The SDK output already is int16 in 0.1°C units: store it as is.
+            # PIL has no signed 16-bit mode, so write the bits as I;16 and
+            # mark the samples as signed.
+            image = Image.frombuffer(
+                'I;16', (width, height), img_data.view('<u2'), 'raw', 'I;16', 0, 1
+            )
+            _save_tiff(image, output_path, tiffinfo=_build_int16_tiffinfo(exif_bytes))
+            return
+
+        # TIFF mode F stores float32, so scale straight into a float32 buffer
+        # (bit-identical to dividing in float64 and converting afterwards)
+        temperature = _get_scratch_buffer(actual_pixels)
+        np.divide(img_data, 10, out=temperature, dtype=np.float32)
+        img_data = temperature.reshape(height, width)
         
-        Image.fromarray(img_data).save(output_path, exif=exif_bytes)
+        _save_tiff(Image.fromarray(img_data), output_path, exif=exif_bytes)
+
+# Image processor of a conversion worker process, set once by _init_convert_worker
+_worker_processor: Optional[ImageProcessor] = None
+
+def _init_convert_worker(processor: ImageProcessor) -> None:
+    """
+    Pool initializer that keeps the image processor in the worker process
+
+    The processor (including its SDK child environment) is sent to each
+    worker once instead of with every image.
+
+    Args:
+        processor: Image processor holding the SDK configuration
+    """
+    global _worker_processor
+    _worker_processor = processor
+
+def _convert_one(input_path: str, raw_path: str, output_path: str) -> None:
+    """
+    Convert one thermal JPG to TIFF (module level so it can run in a worker process)
+
+    Args:
+        input_path: Thermal JPG path
+        raw_path: Temporary RAW file path
+        output_path: TIFF output path
+    """
+    processor = _worker_processor
+    if processor is None:
+        raise RuntimeError("Conversion worker has not been initialized")
+    processor._convert_with_dji_sdk(input_path, raw_path)
+    exif_dict, image_size = processor._read_image_info(input_path)
+    processor._process_raw_image(raw_path, output_path, image_size, exif_dict)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="DJI Image Batch Processing Tool - Simplified Version")
     parser.add_argument("-d", "--directory",
                       default="main",
                       help="Specify root directory path to process (default is 'main')")
+    parser.add_argument("-j", "--workers",
+                      type=int,
+                      default=None,
+                      help="Number of parallel conversion processes (default is CPU count)")
+    parser.add_argument("--int16",
+                      action="store_true",
+                      help="Write 16-bit TIFFs in 0.1°C units instead of 32-bit float TIFFs in °C")
+    parser.add_argument("--sdk-library",
+                      action="store_true",
+                      help="Load the DJI SDK library in-process instead of running dji_irp per image (experimental)")
     
     args = parser.parse_args()
     
-    processor = ImageProcessor()
+    processor = ImageProcessor(args.workers, args.int16, args.sdk_library)
     try:
         print(f"\nProcessing directory: {args.directory}")
         processor.process_subfolders(args.directory)
@@ -1,5 +1,10 @@
 import os
 import argparse
+import functools
+import multiprocessing
+import queue
+from pathlib import Path
+from typing import Any, Callable, List, Optional
 from extract_metadata import MetadataProcessor
 from jpg2tiff import ImageProcessor
 from copy_metadata import MetadataCopier
@@ -21,34 +26,84 @@ Execute the following processing in order:
    - Copy metadata from original JPG to converted TIFF files
 """
 
+def _copy_folder(metadata_copier: MetadataCopier, folder_path: Path) -> None:
+    """
+    Copy metadata of one folder and report the result
+
+    Args:
+        metadata_copier: Metadata copier
+        folder_path: Folder path
+    """
+    success, total = metadata_copier.process_folder(folder_path)
+    if total > 0:
+        print(f"Completed {folder_path.name}: success {success}/{total}")
+
+def _run_stage(
+    handler: Callable[[Path], Any],
+    inbox: Any,
+    outbox: Any,
+    stop: Any,
+    close: Optional[Callable[[], None]] = None
+) -> None:
+    """
+    Run one pipeline stage: process folders from inbox and pass them to outbox
+
+    Args:
+        handler: Function processing one folder
+        inbox: Queue of folders to process, terminated by None
+        outbox: Queue of the next stage (or of completed folders for the last stage)
+        stop: Event set when another stage died, to skip the remaining folders
+        close: Function releasing the stage resources when all folders are done
+    """
+    try:
+        for folder in iter(inbox.get, None):
+            if stop.is_set():
+                continue
+            try:
+                handler(folder)
+            except Exception as e:
+                # Later stages cannot work on a folder whose stage failed
+                print(f"\nError: Exception occurred while processing {folder.name}: {str(e)}")
+                continue
+            outbox.put(folder)
+    finally:
+        outbox.put(None)
+        if close is not None:
+            close()
+
 class ProcessManager:
     """Process manager"""
     
-    def __init__(self, directory: str):
+    def __init__(
+        self, directory: str, workers: Optional[int] = None, direct: bool = False,
+        int16_output: bool = False, sdk_library: bool = False
+    ):
         """
         Initialize process manager
         
         Args:
             directory: Directory path to process
+            workers: Number of parallel workers, default is CPU count
+            direct: Copy metadata directly from the JPG files without reading metadata.txt
+            int16_output: Write 16-bit TIFFs in 0.1°C units instead of 32-bit float TIFFs in °C
+            sdk_library: Load the DJI SDK library in-process instead of running dji_irp per image
         """
         self.directory = directory
+        self.workers = workers
+        self.direct = direct
+        self.int16_output = int16_output
+        self.sdk_library = sdk_library
 
     def run_all(self) -> None:
         """
         Execute all processing steps in order
         """
         try:
-            print("\n===== Step 1: Extract Metadata =====")
-            metadata_processor = MetadataProcessor()
-            metadata_processor.process_all(self.directory)
-
-            print("\n===== Step 2: Convert Image Format =====")
-            image_processor = ImageProcessor()
-            image_processor.process_subfolders(self.directory)
-
-            print("\n===== Step 3: Copy Metadata =====")
-            metadata_copier = MetadataCopier()
-            metadata_copier.process_all(self.directory)
+            subfolders = MetadataProcessor.find_subfolders(self.directory)
+            if len(subfolders) > 1:
+                self._run_pipeline(subfolders)
+            else:
+                self._run_steps()
 
             print("\n===== All Processing Complete! =====")
 
@@ -56,6 +111,100 @@ class ProcessManager:
             print(f"\nError: Exception occurred during processing: {str(e)}")
             raise
 
+    def _run_pipeline(self, subfolders: List[Path]) -> None:
+        """
+        Execute the processing steps as a pipeline over the subfolders
+
+        Each step runs in its own process and hands a folder to the next step
+        as soon as it is done with it, so e.g. the images of one folder are
+        converted while the metadata of the next folder is extracted.
+
+        Args:
+            subfolders: Subfolders to process
+        """
+        print(f"\n===== Processing {len(subfolders)} subfolders in a 3-step pipeline =====")
+        metadata_processor = MetadataProcessor(self.workers)
+        image_processor = ImageProcessor(self.workers, self.int16_output, self.sdk_library)
+        metadata_copier = MetadataCopier(self.workers, self.direct)
+
+        stages = [
+            ("Extract Metadata", metadata_processor.process_folder,
+             metadata_processor.daemon.close),
+            ("Convert Image Format", image_processor.process_folder, None),
+            ("Copy Metadata", functools.partial(_copy_folder, metadata_copier),
+             metadata_copier.daemon.close),
+        ]
+        # Inbox of every stage, followed by the queue of completed folders
+        folder_queues = [multiprocessing.Queue() for _ in range(len(stages) + 1)]
+        done_queue = folder_queues[-1]
+        stop = multiprocessing.Event()
+
+        processes = []
+        for index, (_, handler, close) in enumerate(stages):
+            process = multiprocessing.Process(
+                target=_run_stage,
+                args=(handler, folder_queues[index], folder_queues[index + 1], stop, close)
+            )
+            process.start()
+            processes.append(process)
+
+        for folder in subfolders:
+            folder_queues[0].put(folder)
+        folder_queues[0].put(None)
+
+        completed = set()
+        dead_stages = []
+        while True:
+            try:
+                folder = done_queue.get(timeout=1.0)
+            except queue.Empty:
+                folder = False
+            if folder is None:
+                break
+            if folder:
+                completed.add(folder)
+                continue
+
+            # A stage killed e.g. by a crash in the SDK never passes on its
+            # end marker: stop the other stages and unblock the next one
+            for index, process in enumerate(processes):
+                if process.exitcode not in (None, 0) and index not in dead_stages:
+                    dead_stages.append(index)
+                    print(
+                        f"\nError: Step '{stages[index][0]}' terminated unexpectedly "
+                        f"(exit code {process.exitcode})"
+                    )
+                    stop.set()
+                    folder_queues[index + 1].put(None)
+
+        for process in processes:
+            process.join()
+
+        failed = [folder.name for folder in subfolders if folder not in completed]
+        if dead_stages:
+            names = ", ".join(stages[index][0] for index in dead_stages)
+            raise RuntimeError(f"Pipeline step terminated unexpectedly: {names}")
+        if failed:
+            raise RuntimeError(
+                f"Processing failed for {len(failed)} subfolders: {', '.join(failed)}"
+            )
+
+    def _run_steps(self) -> None:
+        """
+        Execute the processing steps one after another
+        """
+        print("\n===== Step 1: Extract Metadata =====")
+        metadata_processor = MetadataProcessor(self.workers)
+        metadata_processor.process_all(self.directory)
+
+        print("\n===== Step 2: Convert Image Format =====")
+        image_processor = ImageProcessor(self.workers, self.int16_output, self.sdk_library)
+        image_processor.process_subfolders(self.directory)
+
+        print("\n===== Step 3: Copy Metadata =====")
+        metadata_copier = MetadataCopier(self.workers, self.direct)
+        metadata_copier.process_all(self.directory)
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description="DJI Thermal Image Processing Tool")
@@ -65,6 +214,19 @@ def main():
     parser.add_argument("-q", "--quiet", 
                       action="store_true",
                       help="Quiet mode, reduce output information")
+    parser.add_argument("-j", "--workers",
+                      type=int,
+                      default=None,
+                      help="Number of parallel workers (default is CPU count)")
+    parser.add_argument("--direct",
+                      action="store_true",
+                      help="Copy metadata directly from the JPG files without reading metadata.txt")
+    parser.add_argument("--int16",
+                      action="store_true",
+                      help="Write 16-bit TIFFs in 0.1°C units instead of 32-bit float TIFFs in °C")
+    parser.add_argument("--sdk-library",
+                      action="store_true",
+                      help="Load the DJI SDK library in-process instead of running dji_irp per image (experimental)")
 
     args = parser.parse_args()
 
@@ -78,7 +240,9 @@ def main():
         return
 
     try:
-        manager = ProcessManager(args.directory)
+        manager = ProcessManager(
+            args.directory, args.workers, args.direct, args.int16, args.sdk_library
+        )
         manager.run_all()
     except Exception as e:
         print(f"\nProcessing failed: {str(e)}")